@@ -7,9 +7,10 @@
 
 import re
 import csv
-import json
 import argparse
 import datetime
+import orjson
+from concurrent.futures import ThreadPoolExecutor
 
 import sys
 import os
@@ -19,6 +20,10 @@ from JOVEAPI import JOVEAPI
 from NEROAPI import NEROAPI
 
 
+MAX_WORKERS = 16        # concurrent per-device usage pulls against JOVE/NERO
+ROUTER_NAME = re.compile(r'anon-regex', re.IGNORECASE)
+
+
 # ==================================================================================================
 # MAIN
 # ==================================================================================================
@@ -81,8 +86,8 @@ def read_data_from_file():
     Reads offline archived data (originally pulled from JOVE and NERO)
     Output: dict of relevant devices with key = ICCID
     """
-    with open('data/lte_offline_data.json', 'r', encoding='utf-8') as json_file:
-        lte_routers = json.load(json_file)
+    with open('data/lte_offline_data.json', 'rb') as json_file:
+        lte_routers = orjson.loads(json_file.read())
     return lte_routers
 
 
@@ -96,14 +101,16 @@ def pull_jove_data(jove_api):
     recent_routers = jove_api.pull_recent()                   # get IDs for active routers
 
     count = 0
-    for iccid in recent_routers.keys():                         # for each active router
-        print(f"JOVE devices: {count}")
-        if count > 500:
-            break
-        router_usage = jove_api.pull_current_usage(iccid)     # get LTE usage
-        if router_usage['anon'] != 0:
-            lte_routers[iccid] = {'jove_data':router_usage}
-            count += 1
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        usages = executor.map(jove_api.pull_current_usage, recent_routers.keys())     # get LTE usage, results kept in order
+        for iccid, router_usage in zip(recent_routers.keys(), usages):                  # for each active router
+            print(f"JOVE devices: {count}")
+            if count > 500:
+                executor.shutdown(wait=False, cancel_futures=True)                     # drop pulls still queued past the cap
+                break
+            if router_usage['anon'] != 0:
+                lte_routers[iccid] = {'jove_data':router_usage}
+                count += 1
 
     return lte_routers
 
@@ -116,22 +123,21 @@ def pull_nero_data(nero_api, lte_routers, start_time):
     """
     nero_routers = nero_api.pull_net_devices()
 
-    count = 0
-    for iccid, lte_router in list(lte_routers.items()):
-        print(f"NERO devices: {count}")
-        if iccid in nero_routers:
-            if nero_routers[iccid]['anon'] == 'anon':
-                nero_id = nero_routers[iccid]['id']
-                nero_bytes = nero_api.pull_net_device_usage_since_date(nero_id, start_time)
-                lte_router['nero_data'] = nero_routers[iccid]
-                lte_router['nero_bytes'] = nero_bytes
-        if 'nero_data' not in lte_router or 'nero_bytes' not in lte_router:
-            lte_routers.pop(iccid)
-        else:
-            count += 1
-            if count > 10:
-                break
-    return lte_routers
+    candidates = [iccid for iccid in lte_routers
+                  if iccid in nero_routers and nero_routers[iccid]['anon'] == 'anon'][:11]    # cap of 11 devices, as before
+
+    def pull_usage(iccid):
+        return nero_api.pull_net_device_usage_since_date(nero_routers[iccid]['id'], start_time)
+
+    nero_lte_routers = {}                                                                # only devices with NERO data carry over
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        for count, (iccid, nero_bytes) in enumerate(zip(candidates, executor.map(pull_usage, candidates))):
+            print(f"NERO devices: {count}")
+            lte_router = lte_routers[iccid]
+            lte_router['nero_data'] = nero_routers[iccid]
+            lte_router['nero_bytes'] = nero_bytes
+            nero_lte_routers[iccid] = lte_router
+    return nero_lte_routers
 
 
 # ==================================================================================================
@@ -155,11 +161,9 @@ def check_for_router_name(string):
     Checks if a string contains a valid router name
     Output: the router name (uppercase, excluding any other elements of input string), if it exists
     """
-    input_string = string.upper()
-    pattern = r'anon-regex'
-    match = re.search(pattern, input_string)
+    match = ROUTER_NAME.search(string)
     if match:
-        return match.group(1)
+        return match.group(1).upper()
     else:
         return None
 
@@ -199,8 +203,8 @@ def write_lte_routers(lte_routers):
     Writes relevant device data (pulled from JOVE and NERO) to local .json file
     Input: dict of relevant devices with key = ICCID
     """
-    with open('data/lte_offline_data.json', 'w', encoding='utf-8') as json_file:
-        json.dump(lte_routers, json_file, indent=4)
+    with open('data/lte_offline_data.json', 'wb') as json_file:
+        json_file.write(orjson.dumps(lte_routers))
     return
 
 
@@ -208,7 +212,7 @@ def report_to_file(results: dict, rep_path: str):
     """
     Writes report to text file
     """
-    report = "===== LTE Traffic Discrepancies: JOVE reporting >5% higher than NERO =====\n\n"
+    report = ["===== LTE Traffic Discrepancies: JOVE reporting >5% higher than NERO =====\n\n"]
 
     for dev_name, dev_data in results.items():
         jove_usage = dev_data['jove_usage']
@@ -216,13 +220,13 @@ def report_to_file(results: dict, rep_path: str):
         overage = dev_data['overage']
         percentage = dev_data['percentage']
         if percentage == 'infinity' or percentage > 5:
-            report += f"""{dev_name}: JOVE = {jove_usage:.0f} bytes
+            report.append(f"""{dev_name}: JOVE = {jove_usage:.0f} bytes
             NERO = {nero_usage:.0f} bytes
             Overage (JOVE - NERO) = {overage:.0f} bytes
-            Percentage (Overage / NERO) = {percentage}%\n\n"""
+            Percentage (Overage / NERO) = {percentage}%\n\n""")
 
     with open(rep_path, 'w', encoding='utf-8') as file:
-        file.write(report)
+        file.write(''.join(report))
 
     return
 
@@ -234,17 +238,10 @@ def csv_to_file(results: dict, csv_path: str):
     head = ['name', 'MTD JOVE Usage', 'MTD NERO Usage',
             'Overage (JOVE-NC)', 'Percentage (Overage/NC)']
     with open(csv_path, mode='w', encoding='utf-8', newline='') as file:
-        writer = csv.DictWriter(file, fieldnames=head)
-        writer.writeheader()
-        for name, data in results.items():
-            row = {
-                'name': name,
-                'MTD JOVE Usage': data['jove_usage'],
-                'MTD NERO Usage': data['nero_usage'],
-                'Overage (JOVE-NC)': data['overage'],
-                'Percentage (Overage/NC)': data['percentage']
-            }
-            writer.writerow(row)
+        writer = csv.writer(file)
+        writer.writerow(head)
+        writer.writerows((name, data['jove_usage'], data['nero_usage'], data['overage'], data['percentage'])
+                         for name, data in results.items())
     return
 
 
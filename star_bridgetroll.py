@@ -7,10 +7,9 @@
 
 import re
 import csv
-import json
 import argparse
 import datetime
-import pytz
+import orjson
 
 import sys
 import os
@@ -25,6 +24,8 @@ from StarlinkRouter import StarlinkRouter
 START_DATE = ''
 END_DATE = ''
 
+ARES_OCTETS = re.compile(r'^([^\n-]{8})-[^\n]*?,([^,\n]+),IF-MIB\.ifHC(In|Out)Octets,=,(\d+)', re.M)    # router, interface, direction, octets
+
 
 # ========================================================================================================================================================
 # MAIN
@@ -57,9 +58,10 @@ def main():
     print("Pulling traffic on interfaces from ares...")
     star_routers = get_ares_traffic(ares_api, star_routers)
 
-    output_dict = {key: obj.__dict__ for key, obj in star_routers.items()}
-    with open('output.json', 'w') as file:
-        json.dump(output_dict, file, indent=4)
+    output_dict = {key: {attr: val for attr, val in obj.__dict__.items() if not attr.startswith('_')}     # skip cached internals
+                   for key, obj in star_routers.items()}
+    with open('output.json', 'wb') as file:
+        file.write(orjson.dumps(output_dict, option=orjson.OPT_INDENT_2))     # human-inspection dump, keep it readable
 
     print("Comparing Starlink and ares...")
     results = compare_traffic(star_routers)
@@ -115,12 +117,12 @@ def get_venus_interfaces(venus_api, star_routers: dict):
     """
     venus_routers = venus_api.pull_routers()
     for venus_router in venus_routers:
-        router_name = venus_router['name'].upper()
-        if router_name in star_routers:
-            if venus_router['links']:
-                for link in venus_router['links']:
-                    if link['isp'] == 'Starlink':
-                        star_routers[router_name].venus_interface = link['interface']       # Ares API will need to know which interface is handling Starlink traffic
+        if not venus_router.get('links'):                                   # cheap check first, skip name upper-casing for link-less routers
+            continue
+        if star_router := star_routers.get(venus_router['name'].upper()):
+            for link in venus_router['links']:
+                if link['isp'] == 'Starlink':
+                    star_router.venus_interface = link['interface']         # Ares API will need to know which interface is handling Starlink traffic
     return star_routers
 
 
@@ -128,26 +130,32 @@ def get_ares_traffic(ares_api, star_routers: dict):
     """
     Pulls from Ares API to get traffic through Starlink interfaces
     """
+    if not any(router.venus_interface for router in star_routers.values()):      # no Starlink interfaces known, nothing in ares could match
+        return star_routers
+
     start_date = None
     end_date = None
 
     if star_router := next(iter(star_routers.values()), None):      # if there are star_routers, use arbitrary one to set start/end date
-        start_datetime = datetime.datetime.strptime(star_router.start_date, "%Y-%m-%d")
-        end_datetime = datetime.datetime.strptime(star_router.end_date, "%Y-%m-%d")
+        start_datetime = datetime.datetime.fromisoformat(star_router.start_date)
+        end_datetime = datetime.datetime.fromisoformat(star_router.end_date)
         end_datetime = end_datetime - datetime.timedelta(days=1)    # ares dates are inclusive, while starlink excludes end date; remove it
-        start_datetime = start_datetime.astimezone(pytz.utc)        # ares uses PST, starlink uses UTC; offset start and end
-        end_datetime = end_datetime.astimezone(pytz.utc)
+        # ares uses PST, starlink uses UTC; offset start and end
+        start_datetime = start_datetime.astimezone(datetime.timezone.utc)
+        end_datetime = end_datetime.astimezone(datetime.timezone.utc)
         start_date = start_datetime.strftime("%Y-%m-%d %H:%M:%S")   # back to strings, for ares pull
         end_date = end_datetime.strftime("%Y-%m-%d %H:%M:%S")
 
     function = f'anonymized Ares pull using {start_date} and {end_date} to get appropriate data'
     ares_traffic_all = ares_api.web_adb(function)
-    lines = ares_traffic_all.splitlines()
-    for line in lines:
-        if line[8] == '-':
-            line_router = line[:8].upper()
-            if line_router in star_routers.keys():
-                star_routers[line_router].ares_traffic += line
+    counted = set()                                                 # (router, direction) pairs already counted
+    for match in ARES_OCTETS.finditer(ares_traffic_all):            # single pass over whole pull, dispatching each line to its router
+        line_router, interface, direction, octets = match.groups()
+        line_router = line_router.upper()
+        if router := star_routers.get(line_router):
+            if interface == router.venus_interface and (line_router, direction) not in counted:
+                counted.add((line_router, direction))               # only first In and first Out counter per router
+                router.ares_total_bytes += float(octets)
     return star_routers
 
 
@@ -196,7 +204,7 @@ def report_to_file(results: dict, report_filename: str):
     Writes report to text file
     """
     global START_DATE, END_DATE
-    report = f"===== Unexpected Traffic Discrepancies: {START_DATE} to {END_DATE} =====\n"
+    report = [f"===== Unexpected Traffic Discrepancies: {START_DATE} to {END_DATE} =====\n"]
     for name, router in results.items():
         star_total = router['star_total'] or 0.00
         leeway = router['leeway'] or 0.00
@@ -204,16 +212,16 @@ def report_to_file(results: dict, report_filename: str):
         overage = router['overage'] or 0.00
         over_leeway = router['over_leeway'] or 0.00
         if over_leeway != 0:
-            report += f"""=== {name} ===
+            report.append(f"""=== {name} ===
     Starlink GB: {star_total:.4f}
     ares GB: {ares_total:.4f}
     Overage: {overage:.4f}
     Expected Leeway: {leeway:.4f}
     GB Over Expected: {over_leeway:.4f}
-    """
+    """)
 
     with open(report_filename, 'w') as file:
-        file.write(report)
+        file.write(''.join(report))
     return
 
 
@@ -223,18 +231,15 @@ def csv_to_file(results: dict, csv_filename: str):
     """
     head = ['name', 'star_total', 'leeway', 'ares_total', 'overage', 'over_leeway']
     with open(csv_filename, mode='w', newline='') as file:
-        writer = csv.DictWriter(file, fieldnames=head)
-        writer.writeheader()
-        for name, data in results.items():
-            row = {
-                'name': name,
-                'star_total': f"{data['star_total']:.4f}",
-                'leeway': f"{data['leeway']:.4f}",
-                'ares_total': f"{data['ares_total']:.4f}",
-                'overage': f"{data['overage']:.4f}",
-                'over_leeway': f"{data['over_leeway']:.4f}"
-            }
-            writer.writerow(row)
+        writer = csv.writer(file)
+        writer.writerow(head)
+        writer.writerows((name,
+                          f"{data['star_total']:.4f}",
+                          f"{data['leeway']:.4f}",
+                          f"{data['ares_total']:.4f}",
+                          f"{data['overage']:.4f}",
+                          f"{data['over_leeway']:.4f}")
+                         for name, data in results.items())
     return
 
 
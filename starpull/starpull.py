@@ -6,7 +6,6 @@
 #
 
 import csv
-import json
 import argparse
 import datetime
 
@@ -18,6 +17,12 @@ from StarlinkAPI import StarlinkAPI
 from StarlinkTraffic import StarlinkTraffic
 
 
+MONTH_INDEX = {month: i for i, month in enumerate([
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December"
+])}
+
+
 # ========================================================================================================================================================
 # MAIN
 # ========================================================================================================================================================
@@ -59,8 +64,6 @@ def get_star_traffic(star_api, cycle_count):
     last = False
     while (last == False):
         page = star_api.get_data_usage_cycles(cycle_count=cycle_count, page=page_number)
-        with open('test.json', 'w') as f:
-            json.dump(page, f, indent=4)
         for device in page['content']['results']:
 
             sln = device['serviceLineNumber']
@@ -170,18 +173,16 @@ def to_csv_file_simple(star_traffic: dict, csv_filename: str):
     Writes data to a single CSV file, with columns for each month
     """
     data_by_sln = {}
+    seen_months = set()
 
     for sln, traffic in star_traffic.items():
         data_by_sln[sln] = {
             month_name: f"{month_data['Priority'] + month_data['Standard'] + month_data['Opt-In Priority']:.4f}"
             for month_name, month_data in traffic.months.items()
         }
+        seen_months |= traffic.months.keys()
 
-    month_order = [
-        "January", "February", "March", "April", "May", "June",
-        "July", "August", "September", "October", "November", "December"
-    ]
-    month_names = [month for month in month_order if month in set(month for months in data_by_sln.values() for month in months)]
+    month_names = sorted((month for month in seen_months if month in MONTH_INDEX), key=MONTH_INDEX.__getitem__)
     header = ['SLN'] + month_names
 
     rows = [